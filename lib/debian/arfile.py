@@ -19,7 +19,9 @@ from __future__ import print_function
 
 import sys
 import os
-import copy
+import io
+import mmap
+import struct
 from tarfile import copyfileobj
 
 BSD_FORMAT = 0
@@ -32,11 +34,58 @@ GLOBAL_HEADER_LENGTH = len(GLOBAL_HEADER)
 FILE_HEADER_LENGTH = 60
 FILE_MAGIC = b"`\n"
 
+# name, mtime, owner, group, mode, size, magic; see ArMember.from_buf
+_HEADER_STRUCT = struct.Struct('16s12s6s6s8s10s2s')
+
+_PY3 = sys.version_info[0] >= 3
+
+# defaults for decoding member names, as in tarfile
+_DEFAULT_ENCODING = sys.getfilesystemencoding()
+if sys.version_info >= (3, 2):
+    _DEFAULT_ERRORS = 'surrogateescape'
+else:
+    _DEFAULT_ERRORS = 'strict'
+
 class ArError(Exception):
     pass
 
+# file objects whose fileno() can give access to the bytes they read
+_REAL_FILE_TYPES = (io.FileIO, io.BufferedReader, io.BufferedRandom)
+
+def _real_fileno(fileobj):
+    """Return the file descriptor holding the bytes read from fileobj, or None.
+
+    Not every fileno() method gives one: that of GzipFile refers to the
+    compressed data, and that of tarfile's ExFileObject (a BufferedReader)
+    raises AttributeError."""
+    if not isinstance(fileobj, _REAL_FILE_TYPES):
+        return None
+    try:
+        return fileobj.fileno()
+    except (AttributeError, EnvironmentError, ValueError):
+        return None
+
 def clean_fn(fn):
-    return fn.rstrip().split(b"/")[0]
+    return fn.rstrip().partition(b"/")[0]
+
+def _kernel_copy(outfd, infd, offset, count):
+    """Copy count bytes found at offset in infd to outfd with os.sendfile().
+
+    Return False, without having copied anything, if the kernel refuses to
+    (e.g. for file systems without sendfile support)."""
+    remaining = count
+    while remaining > 0:
+        try:
+            sent = os.sendfile(outfd, infd, offset, remaining)
+        except OSError:
+            if remaining == count:
+                return False
+            raise
+        if sent == 0:
+            raise IOError("end of file reached")
+        offset += sent
+        remaining -= sent
+    return True
 
 class ArMember(object):
     """ Member of an ar archive.
@@ -54,8 +103,14 @@ class ArMember(object):
         - size      size in bytes
         - arfile    ArFile instance this member belongs to"""
 
+    # one instance per member of every archive opened: keep them small
+    __slots__ = ('_name', '_decoded_name', '_endslash', 'mtime', 'owner',
+                 'group', 'fmode', 'size', 'arfile', '_offset', '_end', 'mode',
+                 '_seekpos', '_closed')
+
     def __init__(self, name=''):
         self._name = name     # member name (i.e. filename) in the archive
+        self._decoded_name = None   # cached value of the name property
         self._endslash = 0    # member name had trailing slash
         self.mtime = 0        # last modification time
         self.owner = 0        # owner user
@@ -79,17 +134,15 @@ class ArMember(object):
         if len(buf) < FILE_HEADER_LENGTH:
             raise IOError("Incorrect header length")
 
-        if buf[58:60] != FILE_MAGIC:
-            raise IOError("Incorrect file magic")
+        return cls._from_fields(_HEADER_STRUCT.unpack_from(buf), arfile,
+                                offset, mode=mode)
 
-        if sys.version >= '3':
-            if encoding is None:
-                encoding = sys.getfilesystemencoding()
-            if errors is None:
-                if sys.version >= '3.2':
-                    errors = 'surrogateescape'
-                else:
-                    errors = 'strict'
+    @classmethod
+    def _from_fields(cls, fields, arfile, offset, mode='rb'):
+        """ Construct a ArInfo object from the fields of an unpacked header"""
+        name, mtime, owner, group, fmode, size, magic = fields
+        if magic != FILE_MAGIC:
+            raise IOError("Incorrect file magic")
 
         # http://en.wikipedia.org/wiki/Ar_(Unix)    
         #from   to     Name                      Format
@@ -103,21 +156,23 @@ class ArMember(object):
 
         obj = cls()
         obj.arfile = arfile
-        obj._endslash = int(buf[0:16].rstrip().endswith(b"/") or buf[0] == b'/')
-        obj.size  = int(buf[48:58])
+        stripped = name.rstrip()
+        obj._endslash = int(stripped.endswith(b"/") or
+                            stripped.startswith(b"/"))
+        obj.size  = int(size)
         obj._offset = offset # start-of-data
         obj._end  = obj._offset + obj.size
         if obj._endslash:
-            if buf[0:16].rstrip() == b'//':
+            if stripped == b'//':
                 # this is the long filename mapping data
                 obj.seek(0)
                 arfile._parse_long_fn(obj.read())
                 return False
-        obj._parse_name(buf[0:16])
-        obj.mtime = int(buf[16:28])
-        obj.owner = int(buf[28:34])
-        obj.group = int(buf[34:40])
-        obj.fmode = buf[40:48]  # XXX octal value
+        obj._parse_name(name)
+        obj.mtime = int(mtime)
+        obj.owner = int(owner)
+        obj.group = int(group)
+        obj.fmode = fmode  # XXX octal value
 
         obj.mode  = mode
         return obj
@@ -136,16 +191,20 @@ class ArMember(object):
             # name appendix. E.g. `#1/30' means the filename starts right
             # after the header and runs for 30 bytes.
             long_fn_length = int(name[3:].strip())
-            lfn = self.arfile._fileobj.read(long_fn_length)
+            lfn = self.arfile._read_at(self._offset, long_fn_length)
             self._offset += long_fn_length
             self.size += -long_fn_length
             self._seekpos = 0
             name = lfn
 
         self._name = name
+        self._decoded_name = None
 
     def name():
         def fget(self):
+            # resolved lazily, but only once: this is used as a dict key
+            if self._decoded_name is not None:
+                return self._decoded_name
             if self.arfile.format == GNU_FORMAT:
                 self._endslash = 1
                 if self._name.startswith(b'/'):
@@ -154,8 +213,8 @@ class ArMember(object):
                     # and identified by the offset of that file. E.g. `/30' means
                     # the filename starts at 30 bytes into file `//' and runs until
                     # next newline.
-                    long_fn_index = int(self._name.decode(self.arfile.encoding).split('/', 1)[1].strip())
-                    clean_name = clean_fn(self.arfile._longfn_map[long_fn_index])
+                    long_fn_index = int(self._name[1:])
+                    clean_name = clean_fn(self.arfile._get_long_fn(long_fn_index))
                 else:
                     clean_name = clean_fn(self._name)
             elif self.arfile.format == BSD_FORMAT:
@@ -163,8 +222,9 @@ class ArMember(object):
                 clean_name = clean_fn(self._name)
             else:
                 raise NotImplementedError
-            if sys.version >= '3':
-                clean_name = clean_name.decode(encoding, errors)
+            if _PY3:
+                clean_name = clean_name.decode(self.arfile.encoding, self.arfile.errors)
+            self._decoded_name = clean_name
             return clean_name
         def fset(self, value):
             raise ValueError("NO!")
@@ -180,96 +240,109 @@ class ArMember(object):
         buf = fp.read(FILE_HEADER_LENGTH)
         return cls.from_buf(buf, arfile, encoding=encoding, errors=errors, mode=mode, offset=fp.tell())
 
+    def _copy(self):
+        """Return a shallow copy of this member, bypassing the generic
+        copy.copy() machinery."""
+        new = self.__class__.__new__(self.__class__)
+        for attr in ArMember.__slots__:
+            setattr(new, attr, getattr(self, attr))
+        if hasattr(self, '__dict__'):   # subclasses without __slots__
+            new.__dict__.update(self.__dict__)
+        return new
+
     # file interface
 
     # XXX this is not a sequence like file objects
     def _ensure_open(self):
-        """used to ensure the file is open FIXME: this should probably go out"""
-        if self.arfile._fileobj is None:
+        """Return the archive's file object, which all members share."""
+        fp = self.arfile._fileobj
+        if fp is None:
             raise IOError('I/O operation on closed file')
+        if getattr(fp, 'closed', False):
+            # reads at EOF no longer reach fp, which would have raised this
+            raise ValueError('I/O operation on closed file')
+        return fp
 
     def getheader(self):
         """Returns the header bytes used to add member to archive."""
         name = self.name
+        if not isinstance(name, bytes):
+            name = name.encode(self.arfile.encoding, self.arfile.errors)
         if self.arfile.format == GNU_FORMAT:
-            name += '/'
-        name = name.encode(self.arfile.encoding)
+            name += b'/'
         if len(name) > 16:
             raise NotImplementedError('Long file names are not supported')
-        name = name + b' '*(16-len(name))
-        rest = ('{0.mtime: <9}  {0.owner: <5} {0.group: <5} {0.fmode: <7} {0.size: <10}`\n'.format(self)).encode(self.arfile.encoding)
-        return name + rest
+        fmode = self.fmode
+        if isinstance(fmode, int):
+            fmode = '%o' % fmode
+        elif isinstance(fmode, bytes):
+            fmode = fmode.decode('ascii')
+        # the numeric fields are plain ASCII: format them in one go
+        fields = '%-12d%-6d%-6d%-8s%-10d' % (self.mtime, self.owner,
+                                             self.group, fmode, self.size)
+        return b''.join((name.ljust(16), fields.encode('ascii'), FILE_MAGIC))
 
     def getpadding(self):
         """Returns the padding byte if needed."""
-        if self.size % 2 == 1:
-            return b'\n'
-        return b''
+        return b'\n' * (self.size & 1)
 
     def read(self, size=0):
         self._ensure_open()
-        self.seek(self._seekpos)
-        if size > 0 and size <= self._end - self._offset - self._seekpos: # there's room
-            self.arfile._fileobj.seek(self._offset + self._seekpos)
-            buf = self.arfile._fileobj.read(size)
-            self._seekpos += len(buf)
-            return buf
-
-        if self._offset + self._seekpos >= self._end or self._offset + self._seekpos < self._offset:
+        # the position within the member is tracked here, never via tell()
+        remaining = self.size - self._seekpos
+        if size <= 0 or size > remaining:
+            size = remaining
+        if size <= 0:
             return b''
-        buf = self.arfile._fileobj.read(self._end - self._offset - self._seekpos)
+        buf = self.arfile._read_at(self._offset + self._seekpos, size)
         self._seekpos += len(buf)
         return buf
 
     def readline(self, size=None):
         self._ensure_open()
-
-        self.seek(self._seekpos)
-        if size is not None:
-            buf = self.arfile._fileobj.readline(size)
-        else:
-            buf = self.arfile._fileobj.readline()
-        self._seekpos += len(buf)
-        if self._offset + self._seekpos > self._end:
+        remaining = self.size - self._seekpos
+        if remaining <= 0:
             return b''
-        else:
-            return buf
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        buf = self.arfile._readline_at(self._offset + self._seekpos, size)
+        self._seekpos += len(buf)
+        return buf
 
-    def readlines(self, sizehint=0):
+    def to_bytes(self):
+        """Return the whole content of the member with a single read, without
+        affecting the current position."""
         self._ensure_open()
+        return self.arfile._read_at(self._offset, self.size)
 
-        buf = None
-        lines = []
-        while True:
-            buf = self.readline()
-            if not buf:
-                break
-            lines.append(buf)
-
-        return lines
+    def readlines(self, sizehint=0):
+        # one read of the rest of the member (or of about sizehint bytes,
+        # completed up to the end of the line), split in C
+        data = self.read(sizehint)
+        if sizehint > 0 and data and not data.endswith(b'\n'):
+            data += self.readline()
+        return data.splitlines(True)
 
     def seek(self, offset, whence=0):
         self._ensure_open()
-        if self.arfile._fileobj.tell() < self._offset:
-            self.arfile._fileobj.seek(self._offset)
-
-        if whence < 2 and offset + self.arfile._fileobj.tell() < self._offset:
-            raise IOError("Can't seek at %d" % offset)
-
-        if whence == 1:
-            self.arfile._fileobj.seek(offset, 1)
-        elif whence == 0:
-            self.arfile._fileobj.seek(self._offset + offset, 0)
+        if whence == 0:
+            pos = offset
+        elif whence == 1:
+            pos = self._seekpos + offset
         elif whence == 2:
-            self.arfile._fileobj.seek(self._end + offset, 0)
-        self._seekpos = self.arfile._fileobj.tell() - self._offset
+            pos = self.size + offset
+        else:
+            raise ValueError("Invalid whence (%r)" % whence)
+        if pos < 0:
+            raise IOError("Can't seek at %d" % offset)
+        self._seekpos = pos
 
     def tell(self):
         return self._seekpos
 
     def _tell(self):
-        self._ensure_open()
-        cur = self.arfile._fileobj.tell()
+        fp = self._ensure_open()
+        cur = fp.tell()
 
         if cur < self._offset:
             return 0
@@ -286,12 +359,11 @@ class ArMember(object):
         return self.readline()
 
     def __iter__(self):
-        def nextline():
+        while True:
             line = self.readline()
-            if line:
-                yield line
-
-        return iter(nextline())
+            if not line:
+                return
+            yield line
 
 
 class ArFile(object):
@@ -325,16 +397,13 @@ class ArFile(object):
         self.format = format
         self._endslash = None
         self._modemap = {'r': 'rb', 'a': 'r+b', 'w': 'r+b'}
-        self._longfn_map = {}
+        self._longfn_data = b''     # GNU long filename table ('//' member)
 
         if encoding is None:
-            encoding = sys.getfilesystemencoding()
+            encoding = _DEFAULT_ENCODING
         self.encoding = encoding
         if errors is None:
-            if sys.version >= '3.2':
-                errors = 'surrogateescape'
-            else:
-                errors = 'strict'
+            errors = _DEFAULT_ERRORS
         self.errors = errors
         self.mode = mode
         if self.mode in 'ra':
@@ -353,28 +422,123 @@ class ArFile(object):
             fp = self._fileobj
         else:
             raise ArError("Unable to open valid file")
-        if fp.read(GLOBAL_HEADER_LENGTH) != GLOBAL_HEADER:
-            raise ArError("Unable to find global header")
 
-        while True:
-            newmember = self.armember.from_arfile(fp, self,
-                                           encoding=self.encoding,
-                                           errors=self.errors,
-                                           mode=self.mode)
-            if newmember is None:
-                break
-            if newmember is False:
-                continue
-            if self._endslash is None:
-                self._endslash = newmember._endslash
-            self.members.append(newmember)
-            if self.members[0]._endslash != newmember._endslash:
-                raise ValueError("BSD/GNU filename field format mixup.")
-            self.members_dict[newmember.name] = newmember
-            if newmember.size % 2 == 0: # even, no padding
-                fp.seek(newmember._end, 0) # skip to next header
+        # Walk the member headers in memory rather than issuing a read() and
+        # a seek() per member, when the archive can be mapped.
+        start = fp.tell()
+        buf = self._map_archive(fp)
+        try:
+            if buf is None:
+                if fp.read(GLOBAL_HEADER_LENGTH) != GLOBAL_HEADER:
+                    raise ArError("Unable to find global header")
+                headers = self._read_headers(fp, start + GLOBAL_HEADER_LENGTH)
             else:
-                fp.seek(newmember._end + 1 , 0) # skip to next header
+                if buf[start:start + GLOBAL_HEADER_LENGTH] != GLOBAL_HEADER:
+                    raise ArError("Unable to find global header")
+                headers = self._unpack_headers(buf,
+                                               start + GLOBAL_HEADER_LENGTH)
+
+            # this loop runs once per member: keep lookups out of it
+            from_fields = self.armember._from_fields
+            mode = self.mode
+            members = self.members
+            members_dict = self.members_dict
+            endslash = None
+
+            for fields, datapos in headers:
+                newmember = from_fields(fields, self, datapos, mode=mode)
+                if newmember is False:
+                    continue    # the GNU long filename table, now parsed
+                if endslash is None:
+                    endslash = newmember._endslash
+                    if self._endslash is None:
+                        self._endslash = endslash
+                elif endslash != newmember._endslash:
+                    raise ValueError("BSD/GNU filename field format mixup.")
+                members.append(newmember)
+                members_dict[newmember.name] = newmember
+
+            # leave the file positioned past the last member, ready for
+            # appending (reading the headers did that without a mapping)
+            if buf is not None:
+                fp.seek(len(buf))
+        finally:
+            # member data is read through fp: the archive may be truncated
+            # or rewritten while we are open, and touching a mapping past
+            # the end of the file is fatal (SIGBUS)
+            if buf is not None:
+                buf.close()
+
+    @staticmethod
+    def _unpack_headers(buf, pos):
+        """Yield (header fields, data offset) for each member header of the
+        mapped archive buf, starting at offset pos."""
+        buflen = len(buf)
+        unpack_header = _HEADER_STRUCT.unpack_from
+        hdrlen = FILE_HEADER_LENGTH
+        while pos < buflen:
+            datapos = pos + hdrlen
+            if datapos > buflen:
+                raise IOError("Incorrect header length")
+            # unpack straight from the mapping, without copying the header
+            fields = unpack_header(buf, pos)
+            yield fields, datapos
+            size = int(fields[5])
+            pos = datapos + size + (size & 1)   # skip to next header
+
+    @staticmethod
+    def _read_headers(fp, pos):
+        """Yield (header fields, data offset) for each member header of the
+        archive read from fp, starting at offset pos.
+
+        Only one header is held in memory at a time, for file objects that
+        cannot be mapped (e.g. compressed streams)."""
+        unpack_header = _HEADER_STRUCT.unpack
+        hdrlen = FILE_HEADER_LENGTH
+        while True:
+            fp.seek(pos)    # reading long member names moves fp
+            buf = fp.read(hdrlen)
+            if not buf:
+                return
+            if len(buf) < hdrlen:
+                raise IOError("Incorrect header length")
+            fields = unpack_header(buf)
+            yield fields, pos + hdrlen
+            size = int(fields[5])
+            pos += hdrlen + size + (size & 1)   # skip to next header
+
+    def _map_archive(self, fp):
+        """Return a read-only mmap of the file behind fp, or None if it
+        cannot be mapped."""
+        fd = self._archive_fileno()
+        if fd is None:
+            return None
+        try:
+            return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (EnvironmentError, ValueError):
+            return None     # not mappable (pipes, empty files)
+
+    def _archive_fileno(self):
+        """Return the file descriptor holding the archive bytes, or None (see
+        _real_fileno)."""
+        if self.name:
+            # opened by ourselves; on Python 2 this is not an io object
+            try:
+                return self._fileobj.fileno()
+            except ValueError:  # closed
+                return None
+        return _real_fileno(self._fileobj)
+
+    def _read_at(self, offset, size):
+        """Read size bytes starting at the given archive offset."""
+        self._fileobj.seek(offset)
+        return self._fileobj.read(size)
+
+    def _readline_at(self, offset, size):
+        """Read a line of at most size bytes starting at the given archive
+        offset."""
+        self._fileobj.seek(offset)
+        return self._fileobj.readline(size)
 
     def _truncate_archive(self):
         if self.name:
@@ -391,15 +555,20 @@ class ArFile(object):
             self._fileobj = open(self.name, self._modemap[self.mode])
 
     def _parse_long_fn(self, data):
-        """Parses long filename mapping
+        """Records the long filename mapping
         """
-        pos = 0
-        nextlf = data.find(b'\n', pos)
-        while nextlf > -1:
-            fn = data[pos:nextlf+1]
-            self._longfn_map[pos] = fn
-            pos = nextlf + 1
-            nextlf = data.find(b'\n', pos)
+        # entries are only looked up when a member name refers to them, see
+        # _get_long_fn; no need to split the whole table up front
+        self._longfn_data = data
+
+    def _get_long_fn(self, offset):
+        """Return the long filename table entry starting at offset, without
+        its terminating newline."""
+        data = self._longfn_data
+        end = data.find(b'\n', offset)
+        if end < 0:
+            raise KeyError(offset)
+        return data[offset:end]
 
     def getmember(self, name):
         """ Return the (last occurrence of a) member in the archive whose name
@@ -426,8 +595,24 @@ class ArFile(object):
     def extractall(self, path=None):
         """ Extracts all archive members to specified directory or
         current working directory if path is None. """
-        for m in self.getmembers():
-            self.extract(m, path)
+        fd = self._archive_fileno()
+        if fd is not None and hasattr(os, 'posix_fadvise'):
+            # members are extracted in archive order: let the kernel read
+            # ahead aggressively
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except EnvironmentError:
+                pass
+        # members are at hand: skip extract()'s name lookup and the repeated
+        # isdir() check
+        if path is None:
+            path = '.'
+        isdir = os.path.isdir(path)
+        for m in self.members:
+            if isdir:
+                self._extract_member(m, os.path.join(path, m.name))
+            else:
+                self._extract_member(m, path)
 
     def extract(self, member, path=None):
         """ Extracts an archive member to specified path or current working
@@ -438,30 +623,47 @@ class ArFile(object):
             path = '.'
         if os.path.isdir(path):
             path = os.path.join(path, m.name)
-        fd = open(path, 'wb')
-        m.seek(0)
-        copyfileobj(m, fd, m.size)
-        fd.close()
+        self._extract_member(m, path)
+
+    def _extract_member(self, member, path):
+        """Write the contents of member to the file path."""
+        with open(path, 'wb') as fd:
+            if not self._sendfile(member, fd):
+                member.seek(0)
+                copyfileobj(member, fd, member.size)
+
+    def _sendfile(self, member, fd):
+        """Copy the contents of member to the file object fd inside the
+        kernel, using os.sendfile().
+
+        Return False, without having written anything, if that is not possible
+        and the caller should copy the data itself."""
+        if not hasattr(os, 'sendfile'):
+            return False
+        infd = self._archive_fileno()
+        if infd is None:
+            return False
+        try:
+            outfd = fd.fileno()
+        except (AttributeError, EnvironmentError, ValueError):
+            return False
+        self._fileobj.flush()   # pending appends are not visible to sendfile
+        return _kernel_copy(outfd, infd, member._offset, member.size)
 
     def extractfile(self, member):
-        """ Return a file object corresponding to the requested member. A member
-        can be specified either as a string (its name) or as a ArMember
-        instance. """
-
-        # TODO(jsw): What is the point of this method?  It differs from
-        # getmember in the following ways:
-        #  - It returns the *first* member with the given name instead of the
-        #    last.
-        #  - If member is an ArMember, it uses that ArMember's name as the key.
-        # The former just seems confusing (and this implementation less
-        # efficient than getmember's - probably historical), and I'm having a
-        # hard time seeing the use-case for the latter.
-        for m in self.members:
-            if isinstance(member, self.armember) and m.name == member.name:
-                return m
-            elif member == m.name:
-                return m
-        return None
+        """ Return a file object corresponding to the requested member, or None
+        if there is no such member. A member can be specified either as a
+        string (its name) or as a ArMember instance.
+
+        Like getmember, this returns the last occurrence of a member in case
+        of name collisions. """
+
+        # TODO(jsw): What is the point of this method?  Unlike getmember, if
+        # member is an ArMember, it uses that ArMember's name as the key.  I'm
+        # having a hard time seeing the use-case for that.
+        if isinstance(member, self.armember):
+            member = member.name
+        return self.members_dict.get(member)
 
     def getarmember(self, name=None, fileobj=None):
         """Create a ArInfo object for either the file `name' or the file
@@ -483,6 +685,8 @@ class ArFile(object):
         else:
             st = os.fstat(fileobj.fileno())
         
+        if not isinstance(name, bytes):
+            name = name.encode(self.encoding, self.errors)
         armember._name = name
         armember._endslash = self._endslash
         armember.mtime = int(st.st_mtime)
@@ -502,24 +706,55 @@ class ArFile(object):
     def _addfile(self, armember, fileobj=None):
         if self.mode == 'r':
             raise IOError("File not open for writing")
-        armember = copy.copy(armember)
+        armember = armember._copy()
+        # the member may come from another archive: resolve its name there,
+        # then make it ours so that the header and later reads use this one
+        armember._decoded_name = armember.name
+        armember.arfile = self
+        armember._seekpos = 0
         hdr = armember.getheader()
         assert len(hdr) == 60, "Invalid header length"
-        self._fileobj.write(hdr)
+        fp = self._fileobj
+        # reading members moves the shared file position: always append
+        fp.seek(0, 2)
+        fp.write(hdr)
+        armember._offset = fp.tell()
+        armember._end = armember._offset + armember.size
         if fileobj is None:
-            fileobj = open(armember.name, 'rb')
-        copyfileobj(fileobj, self._fileobj, armember.size)
-        self._fileobj.write(armember.getpadding())
+            with open(armember.name, 'rb') as fileobj:
+                self._write_data(fileobj, armember.size)
+        else:
+            self._write_data(fileobj, armember.size)
+        fp.write(armember.getpadding())
         self.members.append(armember)
         self.members_dict[armember.name] = armember
 
+    def _write_data(self, fileobj, size):
+        """Append size bytes read from fileobj to the archive, inside the
+        kernel when both sides are plain files."""
+        fp = self._fileobj
+        outfd = self._archive_fileno()
+        infd = _real_fileno(fileobj)
+        # sendfile() reads at an explicit offset: not for pipes and the like
+        if (hasattr(os, 'sendfile') and outfd is not None and infd is not None
+                and fileobj.seekable()):
+            fp.flush()      # sendfile writes at the descriptor's position
+            pos = fp.tell()
+            start = fileobj.tell()
+            if _kernel_copy(outfd, infd, start, size):
+                # bring both file objects in line with what was copied
+                fp.seek(pos + size)
+                fileobj.seek(start + size)
+                return
+        copyfileobj(fileobj, fp, size)
+
     def close(self):
         self._fileobj.close()
 
     def __iter__(self):
         """ Iterate over the members of the present ar archive. """
 
-        return iter(self.__members)
+        return iter(self.members)
 
     def __getitem__(self, name):
         """ Same as .getmember(name). """
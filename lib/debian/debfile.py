@@ -18,6 +18,7 @@
 from __future__ import absolute_import, print_function
 
 import gzip
+import io
 import tarfile
 import sys
 
@@ -36,6 +37,8 @@ CHANGELOG_NATIVE = 'usr/share/doc/%s/changelog.gz'  # with package stem
 CHANGELOG_DEBIAN = 'usr/share/doc/%s/changelog.Debian.gz'
 MD5_FILE = 'md5sums'
 
+_PY3 = sys.version_info[0] >= 3
+
 
 class DebError(ArError):
     pass
@@ -58,6 +61,10 @@ class DebPart(object):
     mechanism is the third one (as in deb.data.get_file('/etc/vim/vimrc') ).
     """
 
+    # whether to decompress from an in-memory copy of the member rather than
+    # through many small ArMember.read() calls; only sensible for small parts
+    _in_memory = False
+
     def __init__(self, member):
         self.__member = member  # arfile.ArMember file member
         self.__tgz = None
@@ -72,13 +79,16 @@ class DebPart(object):
 
         if self.__tgz is None:
             name = self.__member.name
+            fileobj = self.__member
+            if self._in_memory:
+                fileobj = io.BytesIO(fileobj.to_bytes())
             if name.endswith('.gz'):
-                gz = gzip.GzipFile(fileobj=self.__member, mode='r')
+                gz = gzip.GzipFile(fileobj=fileobj, mode='r')
                 self.__tgz = tarfile.TarFile(fileobj=gz, mode='r')
             elif name.endswith('.bz2'):
                 # Tarfile's __init__ doesn't allow for r:bz2 modes, but the
                 # open() classmethod does ...
-                self.__tgz = tarfile.open(fileobj=self.__member, mode='r:bz2')
+                self.__tgz = tarfile.open(fileobj=fileobj, mode='r:bz2')
             else:
                 raise DebError("part '%s' has unexpected extension" % name)
         return self.__tgz
@@ -121,8 +131,7 @@ class DebPart(object):
         except KeyError:    # XXX python << 2.5 TarFile compatibility
             fobj = self.tgz().extractfile(fname)
         if encoding is not None:
-            if sys.version >= '3':
-                import io
+            if _PY3:
                 if not hasattr(fobj, 'flush'):
                     # XXX http://bugs.python.org/issue13815
                     fobj.flush = lambda: None
@@ -158,7 +167,7 @@ class DebPart(object):
     def __contains__(self, fname):
         return self.has_file(fname)
 
-    if sys.version < '3':
+    if not _PY3:
         def has_key(self, fname):
             return self.has_file(fname)
 
@@ -176,6 +185,9 @@ class DebData(DebPart):
 
 class DebControl(DebPart):
 
+    # control.tar.* is a few KiB at most and is queried repeatedly
+    _in_memory = True
+
     def scripts(self):
         """ Return a dictionary of maintainer scripts (postinst, prerm, ...)
         mapping script names to script text. """
@@ -211,20 +223,23 @@ class DebControl(DebPart):
             raise DebError("'%s' file not found, can't list MD5 sums" %
                     MD5_FILE)
 
-        md5_file = self.get_file(MD5_FILE, encoding=encoding, errors=errors)
-        sums = {}
+        # read the member at once and split it, rather than line by line
+        content = self.get_content(MD5_FILE, encoding=encoding, errors=errors)
         if encoding is None:
-            newline = b'\r\n'
+            newline, eol = b'\n', b'\r\n'
         else:
-            newline = '\r\n'
-        for line in md5_file.readlines():
+            newline, eol = '\n', '\r\n'
+        lines = content.split(newline)
+        if not lines[-1]:   # trailing newline
+            lines.pop()
+        sums = {}
+        for line in lines:
             # we need to support spaces in filenames, .split() is not enough
-            md5, fname = line.rstrip(newline).split(None, 1)
-            if sys.version >= '3' and isinstance(md5, bytes):
+            md5, fname = line.rstrip(eol).split(None, 1)
+            if _PY3 and isinstance(md5, bytes):
                 sums[fname] = md5.decode()
             else:
                 sums[fname] = md5
-        md5_file.close()
         return sums
 
 
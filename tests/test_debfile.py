@@ -20,24 +20,56 @@
 from __future__ import absolute_import
 
 import unittest
+import io
 import os
+import gzip
 import re
+import shutil
 import stat
+import subprocess
 import sys
+import tarfile
 import tempfile
 import uu
 
-import six
-
 sys.path.insert(0, '../lib/')
 
 from debian import arfile
 from debian import debfile
 
+
+def build_archive(command, archive, members):
+    """Run command (an argv list) to create archive from members, quietly"""
+    with open(os.devnull, 'wb') as devnull:
+        subprocess.check_call(command + [archive] + members,
+                              stdout=devnull, stderr=devnull)
+
+def list_archive(archive):
+    """Return the member names of archive as listed by ar(1)"""
+    output = subprocess.check_output(['ar', 't', archive],
+                                     universal_newlines=True)
+    return [x.strip() for x in output.splitlines()]
+
+
 class TestGNULongArFileFormat(unittest.TestCase):
+    # the archive is built once per class; every test works on a fresh copy
+    # of it since the tests rewrite it
+    build_command = ['ar', 'r']
+    archive_members = ['test_debian_support.py', 'test_deb822.py',
+                       'test_changelog_full_stops']
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pristine = 'testlong.ar.orig'
+        build_archive(cls.build_command, cls.pristine, cls.archive_members)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.pristine):
+            os.unlink(cls.pristine)
+
     def setUp(self):
-        os.system("ar r testlong.ar test_debian_support.py test_deb822.py test_changelog_full_stops >/dev/null 2>&1")
-        assert os.path.exists("testlong.ar")
+        shutil.copyfile(self.pristine, 'testlong.ar')
         self.a = arfile.ArFile("testlong.ar", mode='a')
 
     def tearDown(self):
@@ -63,37 +95,106 @@ class TestGNULongArFileFormat(unittest.TestCase):
         self.assertEqual(len(a2.getmembers()), 1)
 
 class TestBSDLongArFileFormat(TestGNULongArFileFormat):
-    def setUp(self):
-        os.system("bsdtar -c --format ar -f testlong.ar test_debian_support.py test_deb822.py test_changelog_full_stops >/dev/null 2>&1")
-        assert os.path.exists("testlong.ar")
-        self.a = arfile.ArFile("testlong.ar", mode='a')
-
-    def tearDown(self):
-        if os.path.exists('testlong.ar'):
-            os.unlink('testlong.ar')
+    build_command = ['bsdtar', '-c', '--format', 'ar', '-f']
 
 
 class TestArFileWriting(unittest.TestCase):
+    # the archive is built once per class; every test works on a fresh copy
+    # of it since the tests modify it
+    build_command = ['ar', 'r']
+    archive_members = ['test_changelog', 'test_deb822.py']
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pristine = 'test.ar.orig'
+        build_archive(cls.build_command, cls.pristine, cls.archive_members)
+        cls.testmembers = list_archive(cls.pristine)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.pristine):
+            os.unlink(cls.pristine)
+
     def setUp(self):
-        os.system("ar r test.ar test_changelog test_deb822.py >/dev/null 2>&1") 
-        assert os.path.exists("test.ar")
-        with os.popen("ar t test.ar") as ar:
-            self.testmembers = [x.strip() for x in ar.readlines()]
+        shutil.copyfile(self.pristine, 'test.ar')
         self.a = arfile.ArFile("test.ar", mode='a')
 
     def tearDown(self):
-        if os.path.exists('test.ar'):
-            os.unlink('test.ar')
+        for fname in ('test.ar', 'test2.ar'):
+            if os.path.exists(fname):
+                os.unlink(fname)
 
     def test_adding(self):
+        self.assertEqual(self.a.getnames(), self.testmembers)
         self.a.add('test_debfile.py')
         m = self.a.getmember('test_debfile.py')
         self.assertEqual(m.name, 'test_debfile.py')
         self.assertEqual(self.a.getmembers()[-1], m)
+        self.assertEqual(self.a.getnames(),
+                         self.testmembers + ['test_debfile.py'])
 
         self.a2 = arfile.ArFile('test.ar', mode='r')
         m2 = self.a2.getmember('test_debfile.py')
 
+        # appending after reading a member must not overwrite anything
+        self.a.getmembers()[0].read(10)
+        self.a.add('test_tagdb')
+        self.a.close()
+        a = arfile.ArFile('test.ar', mode='r')
+        self.assertEqual(a.getnames(), self.testmembers +
+                         ['test_debfile.py', 'test_tagdb'])
+        m = a.getmember('test_debfile.py')
+        f = open('test_debfile.py', 'rb')
+        self.assertEqual(m.read(), f.read())
+        f.close()
+        a.close()
+
+    def test_addfile_copies_member(self):
+        m = self.a.getarmember('test_tagdb')
+        f = open('test_tagdb', 'rb')
+        self.a.addfile(m, f)
+        f.close()
+        added = self.a.getmembers()[-1]
+        self.assertFalse(added is m)
+        self.assertEqual(added.name, m.name)
+        with open('test_tagdb', 'rb') as f:
+            self.assertEqual(added.read(), f.read())
+
+    def test_addfile_pipe(self):
+        """ test adding a member read from a pipe """
+        m = self.a.getarmember('test_tagdb')
+        proc = subprocess.Popen(['cat', 'test_tagdb'], stdout=subprocess.PIPE)
+        self.a.addfile(m, proc.stdout)
+        proc.stdout.close()
+        proc.wait()
+        with open('test_tagdb', 'rb') as f:
+            self.assertEqual(self.a.getmembers()[-1].read(), f.read())
+
+    def test_addfile_from_other_archive(self):
+        """ test adding a member taken from another archive """
+        src = arfile.ArFile(self.pristine)
+        m = src.getmember('test_deb822.py')
+        self.a.addfile(m, m)
+        src.close()
+        added = self.a.getmembers()[-1]
+        self.assertTrue(added.arfile is self.a)
+        with open('test_deb822.py', 'rb') as f:
+            self.assertEqual(added.read(), f.read())
+        self.a.close()
+
+        a = arfile.ArFile('test.ar')
+        self.assertEqual(a.getnames(), self.testmembers + ['test_deb822.py'])
+        with open('test_deb822.py', 'rb') as f:
+            self.assertEqual(a.getmembers()[-1].read(), f.read())
+        a.close()
+
+    def test_read_truncated(self):
+        """ test reading a member after the archive was truncated """
+        m = self.a.getmembers()[-1]
+        with open('test.ar', 'r+b') as f:
+            f.truncate(100)
+        self.assertEqual(m.read(), b'')
+
     def test_write_mode(self):
         self.a.close()
         a = arfile.ArFile(self.a.name, mode='w')
@@ -111,35 +212,95 @@ class TestArFileWriting(unittest.TestCase):
         self.assertEqual(len(a4.getmembers()), 1)
 
 class TestBSDArFileWriting(TestArFileWriting):
-    def setUp(self):
-        os.system("bsdtar -c --format ar -f test.ar test_debfile.py test_changelog test_deb822.py >/dev/null 2>&1") 
-        assert os.path.exists("test.ar")
-        with os.popen("ar t test.ar") as ar:
-            self.testmembers = [x.strip() for x in ar.readlines()]
-        self.a = arfile.ArFile("test.ar", mode='a')
+    build_command = ['bsdtar', '-c', '--format', 'ar', '-f']
+    archive_members = ['test_debfile.py', 'test_changelog', 'test_deb822.py']
 
-    def tearDown(self):
+class TestArFile(unittest.TestCase):
+    # the tests only read the archive, so it is built once per class
+    build_command = ['ar', 'r']
+    archive_members = ['test_debfile.py', 'test_changelog', 'test_deb822.py']
+
+    @classmethod
+    def setUpClass(cls):
+        build_archive(cls.build_command, 'test.ar', cls.archive_members)
+        cls.testmembers = list_archive('test.ar')
+
+    @classmethod
+    def tearDownClass(cls):
         if os.path.exists('test.ar'):
             os.unlink('test.ar')
 
-class TestArFile(unittest.TestCase):
     def setUp(self):
-        os.system("ar r test.ar test_debfile.py test_changelog test_deb822.py >/dev/null 2>&1")
-        assert os.path.exists("test.ar")
-        with os.popen("ar t test.ar") as ar:
-            self.testmembers = [x.strip() for x in ar.readlines()]
         self.a = arfile.ArFile("test.ar")
 
     def tearDown(self):
-        if os.path.exists('test.ar'):
-            os.unlink('test.ar')
-        if os.path.exists('bsdtest.ar'):
-            os.unlink('bsdtest.ar')
+        self.a.close()
     
     def test_getnames(self):
         """ test for file list equality """
         self.assertEqual(self.a.getnames(), self.testmembers)
 
+    def test_getnames_members_changed(self):
+        """ test that getnames follows changes to the members list """
+        self.assertEqual(self.a.getnames(), self.testmembers)
+        self.a.getmembers().pop()
+        self.assertEqual(self.a.getnames(), self.testmembers[:-1])
+
+    def test_fileobj(self):
+        """ test indexing an archive that is not backed by a real file """
+        with open('test.ar', 'rb') as f:
+            a = arfile.ArFile(fileobj=io.BytesIO(f.read()))
+        self.assertEqual(a.getnames(), self.testmembers)
+        for m in a.getmembers():
+            with open(m.name, 'rb') as f:
+                self.assertEqual(m.read(), f.read())
+
+        tmpf = tempfile.NamedTemporaryFile()
+        a.extract('test_debfile.py', tmpf.name)
+        with open(tmpf.name, 'rb') as f1:
+            with open(__file__, 'rb') as f2:
+                self.assertEqual(f1.read(), f2.read())
+        tmpf.close()
+
+    def test_gzip_fileobj(self):
+        """ test indexing an archive read from a compressed stream """
+        tmpd = tempfile.mkdtemp()
+        try:
+            gzname = os.path.join(tmpd, 'test.ar.gz')
+            with open('test.ar', 'rb') as f:
+                gz = gzip.GzipFile(gzname, 'wb')
+                gz.write(f.read())
+                gz.close()
+
+            gz = gzip.GzipFile(gzname, 'rb')
+            a = arfile.ArFile(fileobj=gz)
+            self.assertEqual(a.getnames(), self.testmembers)
+            for m in a.getmembers():
+                with open(m.name, 'rb') as f:
+                    self.assertEqual(m.read(), f.read())
+            gz.close()
+        finally:
+            shutil.rmtree(tmpd)
+
+    def test_tarfile_member(self):
+        """ test indexing an archive read from a tar file member """
+        tmpd = tempfile.mkdtemp()
+        try:
+            tarname = os.path.join(tmpd, 'test.tar')
+            tar = tarfile.open(tarname, 'w')
+            tar.add('test.ar')
+            tar.close()
+
+            tar = tarfile.open(tarname)
+            a = arfile.ArFile(fileobj=tar.extractfile('test.ar'))
+            self.assertEqual(a.getnames(), self.testmembers)
+            for m in a.getmembers():
+                with open(m.name, 'rb') as f:
+                    self.assertEqual(m.read(), f.read())
+            tar.close()
+        finally:
+            shutil.rmtree(tmpd)
+
     def test_getmember(self):
         """ test for each member equality """
         for member in self.testmembers:
@@ -170,6 +331,19 @@ class TestArFile(unittest.TestCase):
         m.seek(0)
         m.close()
     
+    def test_file_seek_end(self):
+        """ test for reads relative to the end of a member """
+        for m in self.a.getmembers():
+            f = open(m.name, 'rb')
+            data = f.read()
+            f.close()
+
+            m.seek(-10, 2)
+            self.assertEqual(m.tell(), m.size - 10)
+            self.assertEqual(m.read(), data[-10:])
+            self.assertEqual(m.read(), b'')
+            self.assertEqual(m.readline(), b'')
+
     def test_file_read(self):
         """ test for faked read """
         for m in self.a.getmembers():
@@ -181,17 +355,46 @@ class TestArFile(unittest.TestCase):
             m.close()
             f.close()
 
+    def test_file_to_bytes(self):
+        """ test reading a whole member regardless of its position """
+        for m in self.a.getmembers():
+            f = open(m.name, 'rb')
+            m.read(10)
+            self.assertEqual(m.to_bytes(), f.read())
+            self.assertEqual(m.tell(), 10)
+            f.close()
+
     def test_file_readlines(self):
         """ test for faked readlines """
 
         for m in self.a.getmembers():
             f = open(m.name, 'rb')
         
-            self.assertEqual(m.readlines(), f.readlines())
+            self.assertEqual(m.readlines(), f.read().splitlines(True))
             
             m.close()
             f.close()
 
+    def test_file_readlines_sizehint(self):
+        """ test for faked readlines with a size hint """
+
+        for m in self.a.getmembers():
+            f = open(m.name, 'rb')
+            lines = f.readlines()
+            f.close()
+
+            first = m.readlines(100)
+            self.assertTrue(sum(map(len, first)) >= 100)
+            self.assertEqual(first + m.readlines(), lines)
+
+    def test_iter(self):
+        """ test iterating over archive members and member lines """
+        self.assertEqual([m.name for m in self.a], self.testmembers)
+        for m in self.a:
+            f = open(m.name, 'rb')
+            self.assertEqual(list(m), f.readlines())
+            f.close()
+
     def test_armember_reopening(self):
         """ test for reopening a closed member """
         for m in self.a.getmembers():
@@ -202,6 +405,28 @@ class TestArFile(unittest.TestCase):
         for m in self.a.getmembers():
             self.assertRaises(ValueError, m.read)
 
+    def test_extractfile(self):
+        """ test member lookup by name and by ArMember """
+        for member in self.testmembers:
+            m = self.a.getmember(member)
+            self.assertTrue(self.a.extractfile(member) is m)
+            self.assertTrue(self.a.extractfile(m) is m)
+        self.assertEqual(self.a.extractfile('no-such-member'), None)
+
+    def test_extractfile_duplicates(self):
+        """ test that extractfile agrees with getmember on duplicates """
+        build_archive(['ar', 'q'], 'dup.ar',
+                      ['test_changelog', 'test_changelog'])
+        try:
+            a = arfile.ArFile('dup.ar')
+            self.assertEqual(a.getnames(), ['test_changelog'] * 2)
+            last = a.getmembers()[-1]
+            self.assertTrue(a.getmember('test_changelog') is last)
+            self.assertTrue(a.extractfile('test_changelog') is last)
+            a.close()
+        finally:
+            os.unlink('dup.ar')
+
     def test_extract(self):
         """ test extraction """
         tmpf = tempfile.NamedTemporaryFile()
@@ -223,23 +448,29 @@ class TestArFile(unittest.TestCase):
         f2.close()
         os.unlink(tmpf)
 
+    def test_extractall(self):
+        """ test extraction of all members """
+        tmpd = tempfile.mkdtemp()
+        self.a.extractall(tmpd)
+        for member in self.testmembers:
+            tmpf = os.path.join(tmpd, member)
+            f1 = open(tmpf, 'rb')
+            f2 = open(member, 'rb')
+            self.assertEqual(f1.read(), f2.read())
+            f1.close()
+            f2.close()
+            os.unlink(tmpf)
+        os.rmdir(tmpd)
+
 class TestBSDArFile(TestArFile):
     """Run the same tests for BSD style archive file"""
-    def setUp(self):
-        os.system("bsdtar -c --format ar -f test.ar test_debfile.py test_changelog test_deb822.py >/dev/null 2>&1")
-        assert os.path.exists("test.ar")
-        with os.popen("ar t test.ar") as ar:
-            self.testmembers = [x.strip() for x in ar.readlines()]
-        self.a = arfile.ArFile("test.ar")
-
-    def tearDown(self):
-        if os.path.exists('test.ar'):
-            os.unlink('test.ar')
+    build_command = ['bsdtar', '-c', '--format', 'ar', '-f']
 
 
 class TestDebFile(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         def uudecode(infile, outfile):
             uu_deb = open(infile, 'rb')
             bin_deb = open(outfile, 'wb')
@@ -247,26 +478,25 @@ class TestDebFile(unittest.TestCase):
             uu_deb.close()
             bin_deb.close()
 
-        self.debname = 'test.deb'
-        self.broken_debname = 'test-broken.deb'
-        self.bz2_debname = 'test-bz2.deb'
-        uudecode('test.deb.uu', self.debname)
-        uudecode('test-broken.deb.uu', self.broken_debname)
-        uudecode('test-bz2.deb.uu', self.bz2_debname)
-
-        self.debname = 'test.deb'
-        uu_deb = open('test.deb.uu', 'rb')
-        bin_deb = open(self.debname, 'wb')
-        uu.decode(uu_deb, bin_deb)
-        uu_deb.close()
-        bin_deb.close()
+        # the tests never modify the packages, so decode them only once
+        cls.debname = 'test.deb'
+        cls.broken_debname = 'test-broken.deb'
+        cls.bz2_debname = 'test-bz2.deb'
+        uudecode('test.deb.uu', cls.debname)
+        uudecode('test-broken.deb.uu', cls.broken_debname)
+        uudecode('test-bz2.deb.uu', cls.bz2_debname)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.unlink(cls.debname)
+        os.unlink(cls.broken_debname)
+        os.unlink(cls.bz2_debname)
+
+    def setUp(self):
         self.d = debfile.DebFile(self.debname)
 
     def tearDown(self):
         self.d.close()
-        os.unlink(self.debname)
-        os.unlink(self.broken_debname)
-        os.unlink(self.bz2_debname)
 
     def test_missing_members(self):
         self.assertRaises(debfile.DebError,
@@ -310,9 +540,9 @@ class TestDebFile(unittest.TestCase):
         self.assertEqual(md5[b'usr/share/locale/zh_TW/LC_MESSAGES/hello.mo'],
                 'a7356e05bd420872d03cd3f5369de42f')
         md5 = self.d.md5sums(encoding='UTF-8')
-        self.assertEqual(md5[six.u('usr/bin/hello')],
+        self.assertEqual(md5['usr/bin/hello'],
                 '9c1a72a78f82216a0305b6c90ab71058')
-        self.assertEqual(md5[six.u('usr/share/locale/zh_TW/LC_MESSAGES/hello.mo')],
+        self.assertEqual(md5['usr/share/locale/zh_TW/LC_MESSAGES/hello.mo'],
                 'a7356e05bd420872d03cd3f5369de42f')
 
 if __name__ == '__main__':